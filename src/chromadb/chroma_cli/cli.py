@@ -1,24 +1,138 @@
 import click
 import json
+import orjson
 import sys
+import time
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional
+from requests.adapters import HTTPAdapter
 from rich.console import Console
-from .sh import exec_sh_cmd
 
 
+EMBEDDINGS_API_URL = "http://localhost:6002"
+CHROMA_API_URL = "http://localhost:8000/api/v1"
+CHROMA_AUTH = ("agnt", "smth")
+REQUEST_TIMEOUT = 30
+COLLECTION_CACHE_PATH = Path.home() / ".cache" / "chroma_cli" / "collections.json"
+COLLECTION_CACHE_TTL_SECONDS = 300
+
 console = Console()
 
+# Shared session so every command reuses pooled keep-alive connections instead of
+# spawning a shell + curl process (and a fresh TCP handshake) per request.
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
 
 def check_api_health():
     """Check if the embeddings API is running."""
-    cmd = "curl -s -o /dev/null -w '%{http_code}' http://localhost:6002/healthz"
-    output, err = exec_sh_cmd(cmd)
+    try:
+        resp = SESSION.get(f"{EMBEDDINGS_API_URL}/healthz", timeout=5)
+        status_code = resp.status_code
+    except requests.RequestException:
+        status_code = None
 
-    if output is None or output != "200":
+    if status_code != 200:
         console.print("[red]Error:[/red] Embeddings API is not running on http://localhost:6002")
         console.print("[yellow]Please start the API with 'docker-compose up embeddings-api'[/yellow]")
         sys.exit(1)
 
 
+def format_json(content: bytes) -> str:
+    """Pretty-print a raw JSON payload.
+
+    orjson parses and re-serializes in C, avoiding the two pure-Python passes of
+    json.loads + json.dumps on large listings.
+
+    Args:
+      content: The raw JSON bytes.
+
+    Returns:
+      str: The indented JSON, with sorted keys.
+    """
+
+    return orjson.dumps(orjson.loads(content), option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS).decode()
+
+
+def _read_collection_cache() -> dict:
+    try:
+        return json.loads(COLLECTION_CACHE_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_collection_cache(cache: dict) -> None:
+    try:
+        COLLECTION_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        COLLECTION_CACHE_PATH.write_text(json.dumps(cache))
+    except OSError:
+        pass
+
+
+def resolve_collection_id(name: str, refresh: bool = False) -> Optional[str]:
+    """Resolve a collection name to its UUID.
+
+    Resolutions are cached on disk for COLLECTION_CACHE_TTL_SECONDS so repeat
+    commands skip listing every collection.
+
+    Args:
+      name: The collection name.
+      refresh: Ignore any cached entry and list collections again.
+
+    Returns:
+      Optional[str]: The collection UUID, or None if no collection has that name.
+    """
+
+    entry = _read_collection_cache().get(name)
+
+    if not refresh and entry and time.time() - entry.get("ts", 0) < COLLECTION_CACHE_TTL_SECONDS:
+        return entry["id"]
+
+    resp = SESSION.get(f"{CHROMA_API_URL}/collections", auth=CHROMA_AUTH, timeout=REQUEST_TIMEOUT)
+    resp.raise_for_status()
+
+    now = time.time()
+    cache = {coll["name"]: {"id": coll["id"], "ts": now} for coll in resp.json() if coll.get("name")}
+    _write_collection_cache(cache)
+
+    entry = cache.get(name)
+    return entry["id"] if entry else None
+
+
+def _is_stale_collection(resp: requests.Response) -> bool:
+    # Newer servers answer 404 for an unknown collection UUID; 0.5.x answers 400 with an
+    # InvalidCollection error in the body.
+    return resp.status_code == 404 or (resp.status_code == 400 and "InvalidCollection" in resp.text)
+
+
+def send_with_collection_id(name: str, send: Callable[[str], requests.Response]) -> Optional[requests.Response]:
+    """Send a request addressed by collection UUID, retrying once if the cached UUID is stale.
+
+    Args:
+      name: The collection name.
+      send: Issues the request for a given collection UUID.
+
+    Returns:
+      Optional[requests.Response]: The response, or None if the collection does not exist.
+    """
+
+    collection_id = resolve_collection_id(name)
+    if not collection_id:
+        return None
+
+    resp = send(collection_id)
+
+    if _is_stale_collection(resp):
+        collection_id = resolve_collection_id(name, refresh=True)
+        if not collection_id:
+            return None
+        resp = send(collection_id)
+
+    return resp
+
+
 @click.group()
 def cli():
     """ChromaDB CLI tool for managing embeddings and collections."""
@@ -30,29 +144,23 @@ def cli():
 def embed(file_system_path):
     """Embed a filesystem."""
 
-    data = json.dumps({
-        "file_system_path": file_system_path
-    })
-
-    cmd = f"""
-        curl --location 'http://localhost:6002/embed' \
-            --header 'Content-Type: application/json' \
-            --data '{data}'
-    """
-
-    output, err = exec_sh_cmd(cmd)
-
-    if output is None:
-        console.print(f"[red]Error:[/red] {err}")
+    try:
+        resp = SESSION.post(
+            f"{EMBEDDINGS_API_URL}/embed",
+            json={"file_system_path": file_system_path},
+            timeout=None,
+        )
+        resp.raise_for_status()
+    except requests.RequestException as e:
+        console.print(f"[red]Error:[/red] {e}")
         return
 
     try:
-        jsn = json.loads(output)
-        formatted_json = json.dumps(jsn, indent=4, sort_keys=True)
-        console.print(formatted_json)
+        formatted_json = format_json(resp.content)
+        click.echo(formatted_json)
     except json.JSONDecodeError as e:
         console.print(f"[red]Error parsing JSON:[/red] {e}")
-        console.print(f"[yellow]Raw output:[/yellow] {output}")
+        console.print(f"[yellow]Raw output:[/yellow] {resp.text}")
 
 
 @cli.command(name="collections")
@@ -60,21 +168,19 @@ def embed(file_system_path):
 def collections(collection):
     """List all collections."""
 
-    cmd = "curl -u agnt:smth http://localhost:8000/api/v1/collections"
-
-    output, err = exec_sh_cmd(cmd)
-
-    if output is None:
-        console.print(f"[red]Error:[/red] {err}")
+    try:
+        resp = SESSION.get(f"{CHROMA_API_URL}/collections", auth=CHROMA_AUTH, timeout=REQUEST_TIMEOUT)
+        resp.raise_for_status()
+    except requests.RequestException as e:
+        console.print(f"[red]Error:[/red] {e}")
         return
 
     try:
-        jsn = json.loads(output)
-        formatted_json = json.dumps(jsn, indent=4, sort_keys=True)
-        console.print(formatted_json)
+        formatted_json = format_json(resp.content)
+        click.echo(formatted_json)
     except json.JSONDecodeError as e:
         console.print(f"[red]Error parsing JSON:[/red] {e}")
-        console.print(f"[yellow]Raw output:[/yellow] {output}")
+        console.print(f"[yellow]Raw output:[/yellow] {resp.text}")
 
 
 @cli.command(name="search")
@@ -84,25 +190,19 @@ def collections(collection):
 def search(file_system_path, query, limit):
     """Similarity search in a collection using the embeddings API."""
 
-    data = json.dumps({
-        "qry": query,
-        "file_system_path": file_system_path
-    })
-
-    cmd = f"""
-        curl --location 'http://localhost:6002/qry' \
-            --header 'Content-Type: application/json' \
-            --data '{data}'
-    """
-
-    output, err = exec_sh_cmd(cmd)
-
-    if output is None:
-        console.print(f"[red]Error:[/red] {err}")
+    try:
+        resp = SESSION.post(
+            f"{EMBEDDINGS_API_URL}/qry",
+            json={"qry": query, "file_system_path": file_system_path},
+            timeout=REQUEST_TIMEOUT,
+        )
+        resp.raise_for_status()
+    except requests.RequestException as e:
+        console.print(f"[red]Error:[/red] {e}")
         return
 
     try:
-        jsn = json.loads(output)
+        jsn = resp.json()
 
         console.print(f"\n[bold cyan]Search Results for:[/bold cyan] {query}")
         console.print(f"[bold cyan]Path:[/bold cyan] {file_system_path}\n")
@@ -118,7 +218,7 @@ def search(file_system_path, query, limit):
 
     except json.JSONDecodeError as e:
         console.print(f"[red]Error parsing JSON:[/red] {e}")
-        console.print(f"[yellow]Raw output:[/yellow] {output}")
+        console.print(f"[yellow]Raw output:[/yellow] {resp.text}")
 
 
 @cli.command(name="files")
@@ -126,63 +226,37 @@ def search(file_system_path, query, limit):
 def files(collection):
     """List files in a collection."""
 
-    # First get all collections to find the UUID
-    cmd_list = "curl -s -u agnt:smth http://localhost:8000/api/v1/collections"
-    list_output, _ = exec_sh_cmd(cmd_list)
+    console.print("[dim]Fetching documents...[/dim]")
 
-    if list_output is None:
+    # Fetch ALL documents in one round trip; Chroma always returns ids, so the
+    # total count falls out of the same response without a separate /count call.
+    try:
+        resp = send_with_collection_id(
+            collection,
+            lambda collection_id: SESSION.post(
+                f"{CHROMA_API_URL}/collections/{collection_id}/get",
+                auth=CHROMA_AUTH,
+                json={"include": ["metadatas"]},
+                timeout=REQUEST_TIMEOUT,
+            ),
+        )
+    except requests.RequestException:
         console.print("[red]Error:[/red] Could not retrieve collections")
         return
 
-    try:
-        collections = json.loads(list_output)
-        collection_id = None
-
-        # Find the collection by name
-        for coll in collections:
-            if coll.get("name") == collection:
-                collection_id = coll.get("id")
-                break
-
-        if not collection_id:
-            console.print(f"[red]Error:[/red] Collection '{collection}' not found")
-            return
-
-        # Get total count first
-        cmd_count = f"curl -s -u agnt:smth http://localhost:8000/api/v1/collections/{collection_id}/count"
-        count_output, _ = exec_sh_cmd(cmd_count)
-
-        if not count_output:
-            console.print("[red]Error:[/red] Could not get document count")
-            return
-
-        try:
-            total_count = int(count_output.strip())
-        except ValueError:
-            console.print(f"[red]Error:[/red] Invalid count: {count_output}")
-            return
-
-        console.print(f"[dim]Fetching {total_count} documents...[/dim]")
-
-        # Now get ALL documents using the total count
-        data = json.dumps({
-            "limit": total_count,
-            "include": ["metadatas"]
-        })
-
-        cmd = f"""
-            curl -s -u agnt:smth http://localhost:8000/api/v1/collections/{collection_id}/get \
-                --header 'Content-Type: application/json' \
-                --data '{data}'
-        """
-
-        output, err = exec_sh_cmd(cmd)
+    if resp is None:
+        console.print(f"[red]Error:[/red] Collection '{collection}' not found")
+        return
 
-        if output is None:
-            console.print(f"[red]Error:[/red] {err}")
-            return
+    try:
+        resp.raise_for_status()
+    except requests.RequestException as e:
+        console.print(f"[red]Error:[/red] {e}")
+        return
 
-        jsn = json.loads(output)
+    try:
+        jsn = resp.json()
+        total_count = len(jsn.get("ids") or [])
 
         if "metadatas" in jsn and jsn["metadatas"]:
             # Extract unique file paths from metadata
@@ -202,7 +276,6 @@ def files(collection):
 
     except json.JSONDecodeError as e:
         console.print(f"[red]Error parsing JSON:[/red] {e}")
-        console.print(f"[yellow]Raw output:[/yellow] {output}")
 
 
 @cli.command(name="stats")
@@ -210,46 +283,47 @@ def files(collection):
 def stats(collection):
     """Get statistics for a collection."""
 
-    # First get all collections to find the UUID
-    cmd_list = "curl -s -u agnt:smth http://localhost:8000/api/v1/collections"
-    list_output, _ = exec_sh_cmd(cmd_list)
+    # Details and count are independent, so fetch them concurrently over the pooled session
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        details_future = executor.submit(
+            SESSION.get, f"{CHROMA_API_URL}/collections/{collection}", auth=CHROMA_AUTH, timeout=REQUEST_TIMEOUT
+        )
+        count_future = executor.submit(
+            send_with_collection_id,
+            collection,
+            lambda collection_id: SESSION.get(
+                f"{CHROMA_API_URL}/collections/{collection_id}/count", auth=CHROMA_AUTH, timeout=REQUEST_TIMEOUT
+            ),
+        )
 
-    if list_output is None:
-        console.print("[red]Error:[/red] Could not retrieve collections")
+    try:
+        count_resp = count_future.result()
+        # send_with_collection_id returns None when no collection has this name
+        collection_missing = count_resp is None
+    except requests.RequestException:
+        count_resp = None
+        collection_missing = False
+
+    if collection_missing:
+        console.print(f"[red]Error:[/red] Collection '{collection}' not found")
         return
 
     try:
-        collections = json.loads(list_output)
-        collection_id = None
-
-        # Find the collection by name
-        for coll in collections:
-            if coll.get("name") == collection:
-                collection_id = coll.get("id")
-                break
-
-        if not collection_id:
-            console.print(f"[red]Error:[/red] Collection '{collection}' not found")
-            return
-
-        # Get collection details
-        cmd = f"curl -s -u agnt:smth http://localhost:8000/api/v1/collections/{collection}"
-        output, err = exec_sh_cmd(cmd)
-
-        if output is None:
-            console.print(f"[red]Error:[/red] {err}")
-            return
+        resp = details_future.result()
+        resp.raise_for_status()
+    except requests.RequestException as e:
+        console.print(f"[red]Error:[/red] {e}")
+        return
 
-        jsn = json.loads(output)
+    try:
+        jsn = resp.json()
 
         console.print(f"\n[bold cyan]Collection Statistics:[/bold cyan] {collection}\n")
         console.print(f"  ID: {jsn.get('id', 'N/A')}")
         console.print(f"  Name: {jsn.get('name', 'N/A')}")
         console.print(f"  Dimension: {jsn.get('dimension', 'N/A')}")
 
-        # Get count using UUID
-        cmd_count = f"curl -s -u agnt:smth http://localhost:8000/api/v1/collections/{collection_id}/count"
-        count_output, _ = exec_sh_cmd(cmd_count)
+        count_output = count_resp.text.strip() if count_resp is not None and count_resp.ok else None
 
         if count_output:
             try:
@@ -266,7 +340,6 @@ def stats(collection):
 
     except json.JSONDecodeError as e:
         console.print(f"[red]Error parsing JSON:[/red] {e}")
-        console.print(f"[yellow]Raw output:[/yellow] {output}")
 
 
 if __name__ == '__main__':
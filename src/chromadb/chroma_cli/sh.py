@@ -1,21 +1,24 @@
-from typing import Tuple
+from typing import List, Tuple, Union
+import shlex
 import subprocess
 
 
-def exec_sh_cmd(cmd: str) -> Tuple[str, str]:
-    """Executes a bash command.
+def exec_sh_cmd(cmd: Union[str, List[str]]) -> Tuple[str, str]:
+    """Executes a command without going through a shell.
 
     Args:
-      cmd: The command to exectute.
+      cmd: The command to exectute, either as an argument list or a string tokenized with shlex.
 
     Returns:
       Tuple[str, str]: A tuple, with the first value being the output and the second the error, if there is one.
     """
 
+    args = shlex.split(cmd) if isinstance(cmd, str) else cmd
+
     try:
         result = subprocess.run(
-            cmd,
-            shell=True,
+            args,
+            shell=False,
             check=True,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
@@ -23,5 +26,5 @@ def exec_sh_cmd(cmd: str) -> Tuple[str, str]:
         output = result.stdout.decode("utf-8").strip()
         err = result.stderr.decode("utf-8").strip()
         return output, err
-    except subprocess.CalledProcessError as e:
+    except (subprocess.CalledProcessError, OSError) as e:
         return None, str(e)
@@ -1,9 +1,9 @@
 import logging
 from typing import Any, Dict
-from json import dumps as json_dumps
 
-from fastapi import FastAPI, Response, status
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from dapr.ext.fastapi import DaprApp
 from dapr.ext.fastapi import DaprActor
@@ -21,7 +21,7 @@ from endpoints import healthz
 logging.basicConfig(level=logging.DEBUG)
 
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
@@ -63,7 +63,6 @@ async def handle_qry_cmd(cmd: Dict[str, Any]):
 
     output = await process_qry_cmd(cmd)
 
-    resp = json_dumps({"output": output})
     logging.info(f"{handle_qry_cmd.__name__} END.")
 
-    return Response(content=resp, status_code=status.HTTP_200_OK)
+    return {"output": output}
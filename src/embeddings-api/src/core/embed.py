@@ -1,70 +1,246 @@
 import os
-from typing import List, Dict, Any, Awaitable
-from langchain_chroma import Chroma
-from langchain_community.document_loaders import TextLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+import asyncio
+import hashlib
+import tiktoken
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Dict, Any, Awaitable, Tuple
+from langchain_core.documents import Document
+from langchain.embeddings import CacheBackedEmbeddings
+from langchain.storage import LocalFileStore
 from langchain_openai import OpenAIEmbeddings
 from langchain_huggingface import HuggingFaceEmbeddings
-from utls import EnvVarProvider, log, traverse_folder, ChromaHttpClientFactory, generate_sha256
+from utls import EnvVarProvider, log, traverse_folder, split_file_documents, read_file_bytes, ChromaHttpClientFactory, generate_blake2b
 from .actors import create_embedding_actor_proxy
+from .onnx_embed import QuantizedOnnxEmbeddings, DEFAULT_ONNX_CACHE_DIR
 
 
 DEFAULT_CHUNK_SIZE = 1500
 DEFAULT_FILE_PATH_CHUNK_SIZE = 50
 DEFAULT_CHUNK_OVERLAP = 50
+DEFAULT_LOAD_WORKERS = 32
+DEFAULT_CHROMA_BATCH_SIZE = 200
+DEFAULT_EMBEDDING_BATCH_SIZE = 128
+DEFAULT_EMBEDDING_CONCURRENCY = 8
+DEFAULT_EMBEDDING_MAX_BATCH_TOKENS = 0
+EMBEDDING_TOKEN_ENCODING = "cl100k_base"
+DEFAULT_EMBEDDING_CACHE_DIR = str(Path.home() / ".cache" / "cossessor" / "embeddings")
 DEFAULT_IGNORE_FOLDERS="node_modules,.git,bin,obj,__pycache__,models--sentence-transformers--all-MiniLM-L6-v2"
 DEFAULT_IGNORE_FILE_EXTS=".pfx,.crt,.cer,.pem,.postman_collection.json,.postman_environment,.png,.gif,.jpeg,.jpg,.ico,.svg,.woff,.woff2,.ttf,.gz,.zip,.tar,.tgz,.tar.gz,.rar,.7z,.deb,.pdf,.doc,.docx,.xls,.xlsx,.ppt,.pptx"
 
 env = EnvVarProvider()
 
-
+# Resolved once at import; these don't change for the life of the process.
+CHUNK_SIZE = int(env.get_env_var("CHUNK_SIZE", DEFAULT_CHUNK_SIZE))
+CHUNK_OVERLAP = int(env.get_env_var("CHUNK_OVERLAP", DEFAULT_CHUNK_OVERLAP))
+FILE_PATH_CHUNK_SIZE = int(env.get_env_var("FILE_PATH_CHUNK_SIZE", DEFAULT_FILE_PATH_CHUNK_SIZE))
+IGNORE_FOLDERS = frozenset(env.get_env_var("IGNORE_FOLDERS", DEFAULT_IGNORE_FOLDERS).split(","))
+IGNORE_FILE_EXTS = tuple(env.get_env_var("IGNORE_FILE_EXTS", DEFAULT_IGNORE_FILE_EXTS).split(","))
+LOAD_WORKERS = int(env.get_env_var("LOAD_WORKERS", DEFAULT_LOAD_WORKERS))
+CHROMA_BATCH_SIZE = int(env.get_env_var("CHROMA_BATCH_SIZE", DEFAULT_CHROMA_BATCH_SIZE))
+EMBEDDING_PROVIDER = env.get_env_var("EMBEDDING_PROVIDER", "huggingface").lower()
+EMBEDDING_BATCH_SIZE = int(env.get_env_var("EMBEDDING_BATCH_SIZE", DEFAULT_EMBEDDING_BATCH_SIZE))
+# Remote providers are latency-bound and benefit from concurrent requests; local models
+# already saturate the CPU/GPU, so they default to one batch at a time.
+EMBEDDING_CONCURRENCY = int(
+    env.get_env_var("EMBEDDING_CONCURRENCY", DEFAULT_EMBEDDING_CONCURRENCY if EMBEDDING_PROVIDER == "openai" else 1)
+)
+# Per-request token budget (0 disables), e.g. 8191 with EMBEDDING_BATCH_SIZE=16 for Azure ada-002 deployments.
+EMBEDDING_MAX_BATCH_TOKENS = int(env.get_env_var("EMBEDDING_MAX_BATCH_TOKENS", DEFAULT_EMBEDDING_MAX_BATCH_TOKENS))
+
+# Translation tables strip every unwanted character in a single pass over the path.
+_ACTOR_ID_TABLE = str.maketrans({".": None, "/": None})
+_COLLECTION_NAME_TABLE = str.maketrans({".": None, "/": None, "-": None})
+
+
+@lru_cache(maxsize=1)
 def create_embedding_function():
     """
     Create embedding function based on configured provider.
 
+    The instance is memoized, so the model is only loaded once per process. Document
+    embeddings are cached on disk by text digest, namespaced by provider and model, so
+    unchanged chunks are never sent to the model twice.
+
     Environment variables:
-    - EMBEDDING_PROVIDER: 'openai' or 'huggingface' (default: huggingface)
+    - EMBEDDING_PROVIDER: 'openai', 'huggingface' or 'onnx' (default: huggingface)
     - EMBEDDING_MODEL: Model name (provider-specific defaults)
     - OPENAI_API_KEY: Required if using OpenAI provider
+    - EMBEDDING_BATCH_SIZE: Texts per embedding call, and the HuggingFace encode batch size (default: 128); HuggingFace runs on CUDA when available
+    - EMBEDDING_CONCURRENCY: Embedding calls in flight at once (default: 8 for openai, 1 otherwise)
+    - EMBEDDING_MAX_BATCH_TOKENS: Token budget per embedding call (default: 0, no token limit)
+    - ONNX_CACHE_DIR: Where the int8-quantized ONNX model is cached (onnx provider only)
+    - EMBEDDING_CACHE_DIR: Where document embeddings are cached (default: ~/.cache/cossessor/embeddings)
 
     Returns:
-        OpenAIEmbeddings or HuggingFaceEmbeddings based on provider
+        CacheBackedEmbeddings wrapping OpenAIEmbeddings, HuggingFaceEmbeddings or QuantizedOnnxEmbeddings based on provider
     """
-    provider = env.get_env_var("EMBEDDING_PROVIDER", "huggingface").lower()
+    provider = EMBEDDING_PROVIDER
 
     if provider == "openai":
         model_name = env.get_env_var("EMBEDDING_MODEL", "text-embedding-3-small")
-        return OpenAIEmbeddings(model=model_name)
+        underlying = OpenAIEmbeddings(model=model_name, api_key=env.get_env_var("OPENAI_API_KEY"))
     elif provider == "huggingface":
+        import torch
+
+        model_name = env.get_env_var("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+        log(f"{create_embedding_function.__name__} -> huggingface device: {device}, batch_size: {EMBEDDING_BATCH_SIZE}")
+        underlying = HuggingFaceEmbeddings(
+            model_name=model_name,
+            model_kwargs={"device": device},
+            encode_kwargs={"batch_size": EMBEDDING_BATCH_SIZE},
+        )
+    elif provider == "onnx":
         model_name = env.get_env_var("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
-        return HuggingFaceEmbeddings(model_name=model_name)
+        cache_dir = env.get_env_var("ONNX_CACHE_DIR", DEFAULT_ONNX_CACHE_DIR)
+        underlying = QuantizedOnnxEmbeddings(model_name=model_name, cache_dir=cache_dir)
     else:
-        raise ValueError(f"Unsupported EMBEDDING_PROVIDER: {provider}. Use 'openai' or 'huggingface'.")
+        raise ValueError(f"Unsupported EMBEDDING_PROVIDER: {provider}. Use 'openai', 'huggingface' or 'onnx'.")
+
+    # Embeddings are deterministic per model and text, so an exact-match store turns
+    # re-embedding unchanged content into local reads.
+    # LocalFileStore keys only allow [a-zA-Z0-9_.-/], and the namespace is prefixed straight onto
+    # the digest, so separate with "/" and end with one.
+    store = LocalFileStore(os.path.expanduser(env.get_env_var("EMBEDDING_CACHE_DIR", DEFAULT_EMBEDDING_CACHE_DIR)))
+    return CacheBackedEmbeddings.from_bytes_store(
+        underlying, store, namespace=f"{provider}/{model_name}/", key_encoder="blake2b"
+    )
 
 
+@lru_cache(maxsize=4096)
 def translate_file_path_to_actor_id(file_path: str) -> str:
-    return file_path.replace(".", "").replace("/", "").lower()
+    return file_path.translate(_ACTOR_ID_TABLE).lower()
 
 
+@lru_cache(maxsize=4096)
 def translate_file_path_to_collection_name(file_path: str) -> str:
-    return file_path.replace(".", "").replace("/", "").replace("-", "")[:36].lower()
+    return file_path.translate(_COLLECTION_NAME_TABLE)[:36].lower()
 
 
+@lru_cache(maxsize=4096)
 def translate_file_path_to_key(file_path: str) -> str:
-    return file_path.replace(".", "__").lower()
+    # Fixed-size deterministic id, free of the "." characters state keys can't contain.
+    return generate_blake2b(file_path.encode(), digest_size=12)
+
+
+def _chunk_ids(source: str, texts: List[str]) -> List[str]:
+    # Content-addressed, so an unchanged chunk keeps its id however the rest of the file shifts.
+    # The source prefix is hashed once per file and its state copied per chunk, which yields
+    # the same digest as hashing f"{source}\0{text}" from scratch.
+    prefix = hashlib.blake2b(f"{source}\0".encode(), digest_size=16)
+    ids = []
+
+    for text in texts:
+        h = prefix.copy()
+        h.update(text.encode())
+        ids.append(h.hexdigest())
+
+    return ids
+
+
+def _split_file(file_path: str, docs: List[Document]) -> Tuple[List[str], List[Document]]:
+    file_split_docs = split_file_documents(docs, CHUNK_SIZE, CHUNK_OVERLAP)
+    file_chunk_ids = _chunk_ids(file_path, [doc.page_content for doc in file_split_docs])
+
+    # Identical chunks within a file share an id; Chroma rejects duplicate ids in one call.
+    file_ids = {}
+
+    for chunk_id, doc in zip(file_chunk_ids, file_split_docs):
+        file_ids.setdefault(chunk_id, doc)
+
+    return list(file_ids.keys()), list(file_ids.values())
+
+
+def _load_file(file_path: str) -> Tuple[str, List[Document]]:
+    # Hash the raw bytes (change detection only, so BLAKE2b rather than SHA-256) and
+    # decode them once, rather than re-encoding the decoded text just to hash it.
+    data = read_file_bytes(file_path)
+    text = data.decode("utf-8", errors="ignore")
+    return generate_blake2b(data), [Document(page_content=text, metadata={"source": file_path})]
+
+
+def _pack_batches(texts: List[str]) -> List[List[str]]:
+    # Greedily fill each call up to EMBEDDING_BATCH_SIZE texts and, when set, EMBEDDING_MAX_BATCH_TOKENS
+    # tokens, so small chunks from many files share a request. Order is preserved, so results
+    # concatenate straight back onto their texts.
+    if not EMBEDDING_MAX_BATCH_TOKENS:
+        return [texts[i:i + EMBEDDING_BATCH_SIZE] for i in range(0, len(texts), EMBEDDING_BATCH_SIZE)]
+
+    encoding = tiktoken.get_encoding(EMBEDDING_TOKEN_ENCODING)
+    batches = []
+    batch = []
+    batch_tokens = 0
+
+    for text in texts:
+        tokens = len(encoding.encode_ordinary(text))
+
+        if batch and (len(batch) >= EMBEDDING_BATCH_SIZE or batch_tokens + tokens > EMBEDDING_MAX_BATCH_TOKENS):
+            batches.append(batch)
+            batch = []
+            batch_tokens = 0
+
+        batch.append(text)
+        batch_tokens += tokens
+
+    if batch:
+        batches.append(batch)
+
+    return batches
+
+
+async def _embed_texts(embedding_function, texts: List[str]) -> np.ndarray:
+    # Run the packed calls with at most EMBEDDING_CONCURRENCY in flight, so remote providers
+    # overlap round trips instead of paying them back to back.
+    semaphore = asyncio.Semaphore(EMBEDDING_CONCURRENCY)
+
+    async def embed_batch(batch: List[str]) -> List[List[float]]:
+        async with semaphore:
+            return await embedding_function.aembed_documents(batch)
+
+    results = await asyncio.gather(*[embed_batch(batch) for batch in _pack_batches(texts)])
+
+    # Hold vectors as one contiguous float32 block (4 bytes per value) rather than lists of
+    # Python floats (~32 bytes per value); float32 is what Chroma stores anyway.
+    return np.asarray([embedding for result in results for embedding in result], dtype=np.float32)
+
 
+async def _upsert_documents(
+    collection, ids: List[str], embeddings: List[np.ndarray], docs: List[Document], batch_size: int
+) -> None:
+    # Chroma's per-call overhead is amortized best at a few hundred records, so write in
+    # batch_size slices regardless of which file each record came from.
+    for i in range(0, len(ids), batch_size):
+        batch_docs = docs[i:i + batch_size]
+        await collection.upsert(
+            ids=ids[i:i + batch_size],
+            embeddings=np.stack(embeddings[i:i + batch_size]),
+            documents=[doc.page_content for doc in batch_docs],
+            metadatas=[doc.metadata for doc in batch_docs],
+        )
 
-async def embed_file_system(file_system_path: str) -> Awaitable:
+
+async def _upsert_and_checkpoint(
+    collection,
+    actor,
+    ids: List[str],
+    embeddings: List[np.ndarray],
+    docs: List[Document],
+    batch_size: int,
+    state: Dict[str, Any],
+) -> None:
+    await _upsert_documents(collection, ids, embeddings, docs, batch_size)
+    await actor.set_state(state)
+
+
+async def embed_file_system(file_system_path: str, batch_size: int = CHROMA_BATCH_SIZE) -> Awaitable:
     log(f"{embed_file_system.__name__} START.")
 
     ####################################
 
-    ignore_folders = env.get_env_var("IGNORE_FOLDERS", DEFAULT_IGNORE_FOLDERS).split(",")
-    ignore_file_exts = env.get_env_var("IGNORE_FILE_EXTS", DEFAULT_IGNORE_FILE_EXTS).split(",")
-    file_path_chunk_size = int(env.get_env_var("FILE_PATH_CHUNK_SIZE", DEFAULT_FILE_PATH_CHUNK_SIZE))
-
-    file_dict = traverse_folder(file_system_path, ignore_folders, ignore_file_exts)
-    file_paths = [f"{k}/{f}" for k, v in file_dict.items() for f in v]
+    file_paths = traverse_folder(file_system_path, IGNORE_FOLDERS, IGNORE_FILE_EXTS)
 
     file_system_actor_id = translate_file_path_to_actor_id(file_system_path)
     file_system_collection_name = translate_file_path_to_collection_name(file_system_path)
@@ -77,53 +253,132 @@ async def embed_file_system(file_system_path: str) -> Awaitable:
 
     ####################################
 
-    chunk_size = env.get_env_var("CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
-    chunk_overlap = env.get_env_var("CHUNK_OVERLAP", DEFAULT_CHUNK_OVERLAP)
-    chunk_hash = {}
-
-    chroma_client = ChromaHttpClientFactory.create_with_auth()
+    chroma_client = await ChromaHttpClientFactory.create_async_with_auth()
 
     embedding_function = create_embedding_function()
 
-    text_splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(
-        chunk_size=chunk_size, chunk_overlap=chunk_overlap
-    )
-    vector_store = Chroma(
-        embedding_function=embedding_function,
-        client=chroma_client,
-        collection_name=file_system_collection_name,
-    )
+    # Write straight to the collection: Chroma.add_documents ignores precomputed embeddings
+    # and would embed every chunk a second time.
+    collection = await chroma_client.get_or_create_collection(name=file_system_collection_name, embedding_function=None)
+
+    # Cheap stat pre-filter: files whose mtime and size match the recorded state are
+    # skipped before they are read or hashed.
+    changed_files = []
 
     for file_path in file_paths:
+        st = os.stat(file_path)
+        key = translate_file_path_to_key(file_path)
+        entry = actor_state.get(key)
 
-        loader = TextLoader(file_path)
-        docs = loader.load()
+        if entry and entry.get("mtime") == st.st_mtime and entry.get("size") == st.st_size:
+            log(f"{embed_file_system.__name__} SKIPPING -> {file_path} unchanged.")
+            continue
 
-        page_content = docs[0].page_content
-        hash = generate_sha256(page_content)
+        changed_files.append((file_path, key, st))
 
-        if file_path in actor_state:
-            if actor_state.get("file_path", {}).get("hash", None):
-                log(f"{embed_file_system.__name__} SKIPPING -> {file_path} already embedded.")
-                continue
+    # Chunks are buffered across files and upserted in batch_size slices once at least a
+    # full batch is pending, so Chroma pays its per-request overhead per batch, not per file.
+    pending_docs = []
+    pending_embeddings = []
+    pending_ids = []
 
-        split_docs = text_splitter.split_documents(docs)
-        split_texts = [doc.page_content for doc in split_docs]
+    # At most one upsert is in flight: batch k is written while batch k+1 is being embedded.
+    upsert_task = None
 
-        if not len(split_texts):
-            continue
+    loop = asyncio.get_running_loop()
 
-        embeddings = embedding_function.embed_documents(split_texts)
-        ids = [f"{file_path}_{i}" for i in range(len(embeddings))]
+    # Work through the changed files in groups of FILE_PATH_CHUNK_SIZE, so reads and embedding
+    # calls are batched without holding the whole tree in memory.
+    groups = [changed_files[i:i + FILE_PATH_CHUNK_SIZE] for i in range(0, len(changed_files), FILE_PATH_CHUNK_SIZE)]
 
-        vector_store.add_documents(documents=split_docs, embeddings=embeddings, ids=ids)
+    with ThreadPoolExecutor(max_workers=LOAD_WORKERS) as executor:
 
-        key = translate_file_path_to_key(file_path)
+        # File reads are independent IO, so load them concurrently off the event loop.
+        def load_group(group):
+            return asyncio.gather(*[loop.run_in_executor(executor, _load_file, file_path) for file_path, _, _ in group])
+
+        next_load = load_group(groups[0]) if groups else None
+
+        for index, group in enumerate(groups):
+            loaded_files = await next_load
+
+            # Prefetch the next group's files while this one is split and embedded.
+            next_load = load_group(groups[index + 1]) if index + 1 < len(groups) else None
+
+            split_docs = []
+            ids = []
+            sources = []
+            to_split = []
+
+            for (file_path, key, st), (hash, docs) in zip(group, loaded_files):
+
+                # Entries are replaced rather than mutated in place, so state snapshots already
+                # handed to an in-flight upsert stay untouched.
+                entry = actor_state.get(key)
+                already_embedded = entry is not None and entry.get("hash") == hash
+                actor_state[key] = {"hash": hash, "mtime": st.st_mtime, "size": st.st_size}
+
+                if already_embedded:
+                    log(f"{embed_file_system.__name__} SKIPPING -> {file_path} already embedded.")
+                    continue
+
+                sources.append(file_path)
+                to_split.append((file_path, docs))
+
+            # Splitting and hashing are CPU work, so keep them off the event loop. tiktoken releases
+            # the GIL while encoding, so those calls overlap across files; the splitter's own
+            # Python code still runs one thread at a time.
+            split_files = await asyncio.gather(
+                *[loop.run_in_executor(executor, _split_file, file_path, docs) for file_path, docs in to_split]
+            )
+
+            for file_ids, file_split_docs in split_files:
+                ids.extend(file_ids)
+                split_docs.extend(file_split_docs)
+
+            # Look up what the changed files already have in Chroma: chunks that still exist are
+            # neither re-embedded nor rewritten, and chunks no longer produced are removed.
+            if sources:
+                existing = await collection.get(where={"source": {"$in": sources}}, include=[])
+                existing_ids = set(existing["ids"])
+                stale_ids = existing_ids.difference(ids)
+
+                if stale_ids:
+                    await collection.delete(ids=list(stale_ids))
+
+                if existing_ids:
+                    new_chunks = [(chunk_id, doc) for chunk_id, doc in zip(ids, split_docs) if chunk_id not in existing_ids]
+                    ids = [chunk_id for chunk_id, _ in new_chunks]
+                    split_docs = [doc for _, doc in new_chunks]
+
+            # Embed the group's chunks asynchronously, so the in-flight upsert keeps making progress.
+            if split_docs:
+                embeddings = await _embed_texts(embedding_function, [doc.page_content for doc in split_docs])
+
+                pending_docs.extend(split_docs)
+                pending_embeddings.extend(embeddings)
+                pending_ids.extend(ids)
+
+            # The actor state snapshot travels with its batch, so a checkpoint never records
+            # files whose chunks have not been upserted yet.
+            if len(pending_ids) >= batch_size:
+                if upsert_task:
+                    await upsert_task
+
+                upsert_task = asyncio.create_task(
+                    _upsert_and_checkpoint(
+                        collection, actor, pending_ids, pending_embeddings, pending_docs, batch_size, dict(actor_state)
+                    )
+                )
+                pending_docs, pending_embeddings, pending_ids = [], [], []
+
+    if upsert_task:
+        await upsert_task
 
-        if not actor_state.get("file_path", None):
-            actor_state[key] = {}
+    if pending_ids:
+        await _upsert_documents(collection, pending_ids, pending_embeddings, pending_docs, batch_size)
 
-        actor_state[key]["hash"] = hash
+    if changed_files:
         await actor.set_state(actor_state)
 
     ####################################
@@ -0,0 +1,76 @@
+from pathlib import Path
+from typing import List
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+
+DEFAULT_ONNX_CACHE_DIR = str(Path.home() / ".cache" / "cossessor" / "onnx")
+DEFAULT_ONNX_BATCH_SIZE = 32
+DEFAULT_MAX_SEQ_LENGTH = 256
+QUANTIZED_FILE_NAME = "model_quantized.onnx"
+
+
+class QuantizedOnnxEmbeddings(Embeddings):
+    """
+    Sentence-transformers embeddings served from an int8-quantized ONNX Runtime model.
+
+    On first use the model is exported to ONNX, dynamically quantized to int8 and cached
+    under `cache_dir`; later loads reuse the quantized file. Outputs are mean pooled and
+    L2 normalized, matching the sentence-transformers pipeline for all-MiniLM-L6-v2.
+
+    Requires the optional `optimum[onnxruntime]` dependency.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        cache_dir: str = DEFAULT_ONNX_CACHE_DIR,
+        batch_size: int = DEFAULT_ONNX_BATCH_SIZE,
+        max_seq_length: int = DEFAULT_MAX_SEQ_LENGTH,
+    ):
+        try:
+            from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+            from optimum.onnxruntime.configuration import AutoQuantizationConfig
+            from transformers import AutoTokenizer
+        except ImportError as e:
+            raise ImportError(
+                "EMBEDDING_PROVIDER=onnx requires optimum[onnxruntime]. Install it with `uv pip install -e .[onnx]`."
+            ) from e
+
+        model_id = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+        save_dir = Path(cache_dir) / model_id.replace("/", "--")
+
+        if not (save_dir / QUANTIZED_FILE_NAME).exists():
+            model = ORTModelForFeatureExtraction.from_pretrained(model_id, export=True, provider="CPUExecutionProvider")
+            quantizer = ORTQuantizer.from_pretrained(model)
+            qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            quantizer.quantize(save_dir=save_dir, quantization_config=qconfig)
+            AutoTokenizer.from_pretrained(model_id).save_pretrained(save_dir)
+
+        self._tokenizer = AutoTokenizer.from_pretrained(save_dir)
+        self._model = ORTModelForFeatureExtraction.from_pretrained(
+            save_dir, file_name=QUANTIZED_FILE_NAME, provider="CPUExecutionProvider"
+        )
+        self._batch_size = batch_size
+        self._max_seq_length = max_seq_length
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        embeddings = []
+
+        for start in range(0, len(texts), self._batch_size):
+            batch = texts[start:start + self._batch_size]
+            inputs = self._tokenizer(
+                batch, padding=True, truncation=True, max_length=self._max_seq_length, return_tensors="np"
+            )
+            hidden = np.asarray(self._model(**inputs).last_hidden_state)
+
+            mask = inputs["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+            embeddings.extend(pooled.tolist())
+
+        return embeddings
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
@@ -1,6 +1,8 @@
 import os
+from functools import lru_cache
 from typing import Awaitable, Dict, Any
 from langchain_chroma import Chroma
+from chromadb import errors as chroma_errors
 from utls import log, ChromaHttpClientFactory
 from .embed import embed_file_system, create_embedding_function, translate_file_path_to_collection_name
 
@@ -8,6 +10,11 @@ from .embed import embed_file_system, create_embedding_function, translate_file_
 embedding_function = create_embedding_function()
 chroma_client = ChromaHttpClientFactory().create_with_auth()
 
+# Raised for a collection id that no longer exists (the name varies across chromadb versions).
+STALE_COLLECTION_ERRORS = tuple(
+    getattr(chroma_errors, name) for name in ("InvalidCollectionException", "NotFoundError") if hasattr(chroma_errors, name)
+)
+
 
 async def process_embed_cmd(cmd: Dict[str, Any]) -> Awaitable:
     log(f"{process_embed_cmd.__name__} START.")
@@ -21,6 +28,9 @@ async def process_embed_cmd(cmd: Dict[str, Any]) -> Awaitable:
     log(f"{process_embed_cmd.__name__} END.")
 
 
+# The client and embedding function are process-wide, so the collection name is the whole
+# cache key; constructing Chroma costs a get_or_create_collection round trip.
+@lru_cache(maxsize=64)
 def create_retriever(collection_name: str):
     vector_store = Chroma(
         embedding_function=embedding_function,
@@ -39,7 +49,16 @@ async def process_qry_cmd(cmd: Dict[str, Any]) -> Awaitable:
     collection_name = translate_file_path_to_collection_name(file_system_path)
 
     retriever = create_retriever(collection_name)
-    documents = retriever.invoke(qry)
+    # langchain's Chroma wrapper only accepts the sync client; ainvoke runs the lookup
+    # (query embedding + HTTP search) in an executor instead of blocking the event loop.
+    try:
+        documents = await retriever.ainvoke(qry)
+    except STALE_COLLECTION_ERRORS:
+        # The cached wrapper holds the collection id it resolved first; after a reset or a
+        # delete-and-recreate, drop the cache and resolve the collection by name again.
+        log(f"{process_qry_cmd.__name__} STALE COLLECTION -> {collection_name}, refreshing retriever.")
+        create_retriever.cache_clear()
+        documents = await create_retriever(collection_name).ainvoke(qry)
     resp = {"documents": [{"source": doc.metadata["source"], "page_content": doc.page_content} for doc in documents]}
 
     log(f"{process_qry_cmd.__name__} resp: {resp}.")
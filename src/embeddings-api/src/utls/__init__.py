@@ -3,13 +3,17 @@
 from .logger_utls import log
 from .chroma_utls import ChromaHttpClientFactory
 from .env import EnvVarProvider
-from .io import traverse_folder
-from .hash import generate_sha256
+from .io import traverse_folder, create_text_splitter, split_file_documents, read_file_bytes
+from .hash import generate_sha256, generate_blake2b
 
 __all__ = [
     "log",
     "ChromaHttpClientFactory",
     "EnvVarProvider",
     "traverse_folder",
+    "create_text_splitter",
+    "split_file_documents",
+    "read_file_bytes",
     "generate_sha256",
+    "generate_blake2b",
 ]
@@ -2,6 +2,7 @@ from typing import List, Optional
 import chromadb
 import uuid
 import base64
+from functools import lru_cache
 from chromadb.config import Settings
 from .env import EnvVarProvider
 
@@ -15,51 +16,60 @@ DEFAULT_CHUNK_OVERLAP = 50
 
 env = EnvVarProvider()
 
+# Resolved once at import rather than on every factory call.
+CHROMA_HOST = env.get_env_var("CHROMA_HOST", DEFAULT_HOST)
+CHROMA_PORT = int(env.get_env_var("CHROMA_PORT", DEFAULT_PORT))
+CHROMA_USR = env.get_env_var("CHROMA_USR", DEFAULT_USR)
+CHROMA_PWD = env.get_env_var("CHROMA_PWD", DEFAULT_PWD)
+CHROMA_AUTH_CREDENTIALS = f"{CHROMA_USR}:{CHROMA_PWD}"
+CHROMA_AUTH_HEADERS = {"Authorization": f"Basic {base64.b64encode(CHROMA_AUTH_CREDENTIALS.encode()).decode()}"}
+CHROMA_AUTH_PROVIDER = "chromadb.auth.basic_authn.BasicAuthClientProvider"
 
-class ChromaHttpClientFactory:
-    @staticmethod
-    def create_with_auth_header():
-        host = env.get_env_var("CHROMA_HOST", DEFAULT_HOST)
-        port = env.get_env_var("CHROMA_PORT", DEFAULT_PORT)
-        usr = env.get_env_var("CHROMA_USR", DEFAULT_USR)
-        pwd = env.get_env_var("CHROMA_PWD", DEFAULT_PWD)
 
-        auth_str = f"{usr}:{pwd}"
-        encoded_auth = base64.b64encode(auth_str.encode()).decode()
-        headers = {"Authorization": f"Basic {encoded_auth}"}
+class ChromaHttpClientFactory:
+    # Sync clients are per-process singletons so every caller shares one connection pool.
+    # The async client is bound to the event loop it is created on, so it is built per call.
 
+    @classmethod
+    @lru_cache(maxsize=1)
+    def create_with_auth_header(cls):
         chroma_client = chromadb.HttpClient(
-            settings=Settings(allow_reset=True), host=host, port=port, headers=headers
+            settings=Settings(allow_reset=True), host=CHROMA_HOST, port=CHROMA_PORT, headers=dict(CHROMA_AUTH_HEADERS)
         )
 
         return chroma_client
 
 
-    @staticmethod
-    def create_with_auth():
-        host = env.get_env_var("CHROMA_HOST", DEFAULT_HOST)
-        port = env.get_env_var("CHROMA_PORT", DEFAULT_PORT)
-        usr = env.get_env_var("CHROMA_USR", DEFAULT_USR)
-        pwd = env.get_env_var("CHROMA_PWD", DEFAULT_PWD)
-
-        auth_str = f"{usr}:{pwd}"
-
+    @classmethod
+    @lru_cache(maxsize=1)
+    def create_with_auth(cls):
         chroma_client = chromadb.HttpClient(
-            settings=Settings(allow_reset=True, chroma_client_auth_provider="chromadb.auth.basic_authn.BasicAuthClientProvider", chroma_client_auth_credentials=auth_str), 
-            host=host, 
-            port=port
+            settings=Settings(allow_reset=True, chroma_client_auth_provider=CHROMA_AUTH_PROVIDER, chroma_client_auth_credentials=CHROMA_AUTH_CREDENTIALS), 
+            host=CHROMA_HOST, 
+            port=CHROMA_PORT
         )
 
         return chroma_client
 
 
     @staticmethod
-    def create():
-        host = env.get_env_var("CHROMA_HOST", DEFAULT_HOST)
-        port = env.get_env_var("CHROMA_PORT", DEFAULT_PORT)
+    async def create_async_with_auth():
+        # The async client ignores chroma_client_auth_* settings, so send the basic auth header directly.
+        chroma_client = await chromadb.AsyncHttpClient(
+            settings=Settings(allow_reset=True),
+            host=CHROMA_HOST,
+            port=CHROMA_PORT,
+            headers=dict(CHROMA_AUTH_HEADERS),
+        )
+
+        return chroma_client
+
 
+    @classmethod
+    @lru_cache(maxsize=1)
+    def create(cls):
         chroma_client = chromadb.HttpClient(
-            settings=Settings(allow_reset=True), host=host, port=port
+            settings=Settings(allow_reset=True), host=CHROMA_HOST, port=CHROMA_PORT
         )
 
         return chroma_client
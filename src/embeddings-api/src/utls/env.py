@@ -1,20 +1,17 @@
-from environs import Env
+from dotenv import dotenv_values, find_dotenv
 from typing import Optional
 from os import environ
 
 
 class EnvVarProvider:
     def __init__(self):
-        self._env = Env()
-        self._env.read_env(".env")
+        self.refresh()
 
-    def get_env_var(self, key: str, default: Optional[str] = None) -> str:
-
-        if key in environ:
-            return environ[key]
+    def refresh(self) -> None:
+        # .env is merged underneath the process env rather than written into os.environ, so
+        # reading config has no process-wide side effects; process env still takes precedence.
+        dotenv = {k: v for k, v in dotenv_values(find_dotenv(".env", usecwd=True)).items() if v is not None}
+        self._vars = {**dotenv, **environ}
 
-        val = self._env(key, default=None)
-        if not val:
-            return default
-
-        return val
+    def get_env_var(self, key: str, default: Optional[str] = None) -> str:
+        return self._vars.get(key, default)
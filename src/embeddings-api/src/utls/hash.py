@@ -4,3 +4,7 @@ def generate_sha256(content: str) -> str:
     sha256_hash = hashlib.sha256()
     sha256_hash.update(content.encode('utf-8'))
     return sha256_hash.hexdigest()
+
+
+def generate_blake2b(content: bytes, digest_size: int = 16) -> str:
+    return hashlib.blake2b(content, digest_size=digest_size).hexdigest()
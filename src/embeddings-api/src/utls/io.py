@@ -1,6 +1,10 @@
 import os
-from typing import List, Dict, Any, Optional
-from langchain_community.document_loaders import TextLoader
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from typing import List, Iterable, Iterator, Optional, Tuple
+from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from .env import EnvVarProvider
@@ -9,59 +13,137 @@ from .env import EnvVarProvider
 
 DEFAULT_CHUNK_SIZE = 1500
 DEFAULT_CHUNK_OVERLAP = 50
+CHUNK_FILES_BATCH_SIZE = 8
 
 env = EnvVarProvider()
 
+CHUNK_SIZE = int(env.get_env_var("CHUNK_SIZE", DEFAULT_CHUNK_SIZE))
+CHUNK_OVERLAP = int(env.get_env_var("CHUNK_OVERLAP", DEFAULT_CHUNK_OVERLAP))
+
 
 def traverse_folder(
-    folder_path: str, ignore_folders: List[str], ignore_extensions: List[str] = None
-) -> Dict[str, List[str]]:
+    folder_path: str, ignore_folders: Iterable[str], ignore_extensions: Optional[Iterable[str]] = None
+) -> Iterator[str]:
 
     # log(f"{traverse_folder.__name__} START. folder_path: {folder_path}")
 
-    file_dict = {}
+    # frozenset gives O(1) folder membership; str.endswith accepts a tuple of suffixes
+    # and checks them all in a single C-level call.
+    ignore_folders = frozenset(ignore_folders)
+    ignore_extensions = tuple(ignore_extensions or ())
 
+    # Paths are yielded as the walk reaches them, so large trees are never held in memory.
     for root, dirs, files in os.walk(folder_path):
         dirs[:] = [d for d in dirs if d not in ignore_folders]
 
-        if ignore_extensions:
-            files = [
-                f
-                for f in files
-                if not any(f.endswith(ext) for ext in ignore_extensions)
-            ]
-
-        file_dict[root] = files
+        for f in files:
+            if not (ignore_extensions and f.endswith(ignore_extensions)):
+                yield f"{root}/{f}"
 
     # log(f"{traverse_folder.__name__} END.")
 
-    return file_dict
 
+@lru_cache(maxsize=8)
+def create_text_splitter(chunk_size: int, chunk_overlap: int) -> RecursiveCharacterTextSplitter:
+    # from_tiktoken_encoder loads the BPE tables and compiles its regexes, so build each
+    # configuration once and share it.
+    return RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+        chunk_size=chunk_size, chunk_overlap=chunk_overlap
+    )
 
-def chunk_files(
-    file_paths: List[str],
-    chunk_size: Optional[int] = None,
-    chunk_overlap: Optional[int] = None,
-) -> Dict[str, Dict[str, Any]]:
-    chunk_size = chunk_size or env.get_env_var("CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
-    chunk_overlap = chunk_overlap or env.get_env_var("CHUNK_OVERLAP", DEFAULT_CHUNK_OVERLAP)
 
-    chunk_hash = {}
+def read_file_bytes(file_path: str) -> bytes:
+    # Unbuffered read sized from fstat: one open, usually one read syscall, and no text-mode
+    # decoding layer; callers decode the whole buffer in a single call.
+    fd = os.open(file_path, os.O_RDONLY)
 
-    for file_path in file_paths:
-        loader = TextLoader(file_path)
-        docs = loader.load()
+    try:
+        size = os.fstat(fd).st_size
+        chunks = []
 
-        text_splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(
-            chunk_size=chunk_size, chunk_overlap=chunk_overlap
-        )
+        while True:
+            chunk = os.read(fd, max(size, 1 << 16))
+            if not chunk:
+                break
+            chunks.append(chunk)
 
-        split_docs = text_splitter.split_documents(docs)
-        split_texts = [doc.page_content for doc in split_docs]
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
 
-        if not len(split_texts):
+
+def split_file_documents(docs: List[Document], chunk_size: int, chunk_overlap: int) -> List[Document]:
+    split_docs = []
+
+    for doc in docs:
+        text = doc.page_content
+
+        # A token covers at least one UTF-8 byte, so text whose byte length fits in chunk_size
+        # tokens is a single chunk; skip the tiktoken encode and emit what the splitter would
+        # (the stripped text, or nothing if it is blank). Non-ASCII text is bounded at 4 bytes/char.
+        if (len(text) if text.isascii() else 4 * len(text)) <= chunk_size:
+            text = text.strip()
+            if text:
+                split_docs.append(Document(page_content=text, metadata=dict(doc.metadata)))
             continue
 
-        chunk_hash[file_path] = {"split_docs": split_docs, "split_texts": split_texts}
+        split_docs.extend(create_text_splitter(chunk_size, chunk_overlap).split_documents([doc]))
+
+    return split_docs
+
 
-    return chunk_hash
+def _chunk_one_file(file_path: str, chunk_size: int, chunk_overlap: int) -> Tuple[str, List[Document], List[str]]:
+    # Empty files have nothing to chunk, so don't open them.
+    if not os.path.getsize(file_path):
+        return file_path, [], []
+
+    text = read_file_bytes(file_path).decode("utf-8", errors="ignore")
+    docs = [Document(page_content=text, metadata={"source": file_path})]
+
+    split_docs = split_file_documents(docs, chunk_size, chunk_overlap)
+    split_texts = [doc.page_content for doc in split_docs]
+
+    return file_path, split_docs, split_texts
+
+
+def _chunk_file_batch(
+    file_paths: List[str], chunk_size: int, chunk_overlap: int
+) -> List[Tuple[str, List[Document], List[str]]]:
+    return [_chunk_one_file(file_path, chunk_size, chunk_overlap) for file_path in file_paths]
+
+
+def chunk_files(
+    file_paths: Iterable[str],
+    chunk_size: Optional[int] = None,
+    chunk_overlap: Optional[int] = None,
+    max_workers: Optional[int] = None,
+) -> Iterator[Tuple[str, List[Document], List[str]]]:
+    chunk_size = int(chunk_size or CHUNK_SIZE)
+    chunk_overlap = int(chunk_overlap or CHUNK_OVERLAP)
+    max_workers = max_workers or os.cpu_count()
+
+    # Note: nothing calls chunk_files at present; embed_file_system splits on its own thread pool.
+    # tiktoken releases the GIL while encoding, but the splitter's recursive splitting and
+    # merging is Python code that holds it, so fan files out across processes rather than
+    # threads; each worker builds (and caches) its own splitter. Executor.map would
+    # drain file_paths and submit everything up front, so batches go through a bounded
+    # window instead: at most 2 * max_workers batches are queued or awaiting collection.
+    file_paths = iter(file_paths)
+    window = deque()
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        while True:
+            while len(window) < 2 * max_workers:
+                batch = list(islice(file_paths, CHUNK_FILES_BATCH_SIZE))
+                if not batch:
+                    break
+                window.append(executor.submit(_chunk_file_batch, batch, chunk_size, chunk_overlap))
+
+            if not window:
+                break
+
+            for file_path, split_docs, split_texts in window.popleft().result():
+                if not len(split_texts):
+                    continue
+
+                yield file_path, split_docs, split_texts